@@ -1,9 +1,11 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass, field
+import os
+import sys
+from dataclasses import KW_ONLY, dataclass, field
 from datetime import date, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from exceptions import (
     LibraryError,
@@ -16,8 +18,22 @@ from exceptions import (
 
 
 # Logging configuration
+# Per-operation logs are emitted at DEBUG; set LIBRARY_LOG_LEVEL=DEBUG to see them.
+def _parse_log_level(value: str) -> Optional[int]:
+    """
+    Converts a level name ("debug", "INFO") or number ("10") to a logging
+    level, or returns None if it is not recognized.
+    """
+    value = value.strip()
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    level = logging.getLevelName(value.upper())
+    return level if isinstance(level, int) else None
+
+
 logger = logging.getLogger("library")
-logger.setLevel(logging.INFO)
 
 if not logger.handlers:
     handler = logging.StreamHandler()
@@ -27,9 +43,18 @@ if not logger.handlers:
     handler.setFormatter(formatter)
     logger.addHandler(handler)
 
+_env_level = os.environ.get("LIBRARY_LOG_LEVEL") or "WARNING"
+_level = _parse_log_level(_env_level)
+if _level is None:
+    # A bad setting should not stop the module from importing
+    logger.setLevel(logging.WARNING)
+    logger.warning("Unknown LIBRARY_LOG_LEVEL %r, using WARNING", _env_level)
+else:
+    logger.setLevel(_level)
+
 
 # Domain Models
-@dataclass
+@dataclass(slots=True)
 class Book:
     """
     Represents a book in the library.
@@ -46,7 +71,7 @@ class Book:
     isAvailable: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class BorrowRecord:
     """
     Internal helper record that tracks a single borrow lifecycle.
@@ -61,11 +86,26 @@ class BorrowRecord:
         checkoutDate (date): Date when the book was checked out.
         dueDate (date): Due date (checkout + 14 days).
         returnDate (Optional[date]): Date when the book was returned, if any.
+        fineCents (int): Final overdue fine in cents, set once the book is returned.
+        dueOrdinal (int): dueDate.toordinal(), used for fine arithmetic.
+        _view (dict): Cached history entry returned by getMemberBorrowingHistory.
     """
     isbn: str
     checkoutDate: date
     dueDate: date
     returnDate: Optional[date] = None
+    fineCents: int = 0
+    dueOrdinal: int = field(init=False, repr=False, compare=False)
+    _view: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.dueOrdinal = self.dueDate.toordinal()
+        self._view = {
+            "isbn": self.isbn,
+            "checkoutDate": self.checkoutDate,
+            "dueDate": self.dueDate,
+            "returnDate": self.returnDate,
+        }
 
     def is_open(self) -> bool:
         """
@@ -74,7 +114,7 @@ class BorrowRecord:
         return self.returnDate is None
 
 
-@dataclass
+@dataclass(slots=True)
 class Member:
     """
     Represents a library member.
@@ -82,15 +122,65 @@ class Member:
     Attributes:
         memberId (str): Unique member identifier.
         name (str): Member name.
-        borrowedBooks (List[str]): List of currently borrowed book ISBNs.
-        fineBalance (float): Accumulated unpaid fines.
+        borrowedBooks (Dict[str, BorrowRecord]): Currently borrowed book ISBNs
+            mapped to their open borrow record.
+        fineBalanceCents (int): Accumulated unpaid fines in cents; the dollar
+            value is read and written through the fineBalance property.
+        closedFineCents (int): Fines already settled by returned records, in cents.
         _history (List[BorrowRecord]): Internal borrowing history.
+        _history_view (List[dict]): Cached history entries, parallel to _history.
+        _min_open_due (Optional[date]): Earliest due date among open records.
     """
     memberId: str
     name: str
-    borrowedBooks: List[str] = field(default_factory=list)
-    fineBalance: float = 0.0
+    borrowedBooks: Dict[str, BorrowRecord] = field(default_factory=dict)
+    # Keyword-only from here: a positional 4th argument used to be fineBalance
+    # in dollars and must not be silently read as cents
+    _: KW_ONLY
+    fineBalanceCents: int = 0
     _history: List[BorrowRecord] = field(default_factory=list)
+    # Caches derived from _history and borrowedBooks, maintained by Library
+    closedFineCents: int = field(default=0, init=False, repr=False, compare=False)
+    _history_view: List[dict] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _min_open_due: Optional[date] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def fineBalance(self) -> float:
+        """
+        Accumulated unpaid fines in dollars.
+        """
+        return self.fineBalanceCents / 100
+
+    @fineBalance.setter
+    def fineBalance(self, value: float) -> None:
+        self.fineBalanceCents = round(value * 100)
+
+
+def _intern_key(key: str) -> str:
+    """
+    Interns str keys so dict lookups can match on identity. sys.intern only
+    accepts exact str, so subclasses and non-string keys are returned as is.
+    """
+    return sys.intern(key) if type(key) is str else key
+
+
+def _sum_open_fines(due_ordinals: List[int], on_ord: int, fine_per_day: int) -> int:
+    """
+    Sums the overdue fine in cents for open records with the given due ordinals.
+
+    Kept as a standalone, int-only function so it can be compiled
+    (e.g. with mypyc) without touching the Library API.
+    """
+    total = 0
+    for due in due_ordinals:
+        overdue_days = on_ord - due
+        if overdue_days > 0:
+            total += overdue_days * fine_per_day
+    return total
 
 
 # Library Core
@@ -107,8 +197,12 @@ class Library:
 
     MAX_BORROWED = 3
     DUE_DAYS = 14
+    _DUE_DELTA = timedelta(days=DUE_DAYS)
     FINE_PER_DAY = 0.50
     FINE_BLOCK_THRESHOLD = 10.00
+    # Fines are tracked internally in integer cents, derived from the dollar rules
+    FINE_PER_DAY_CENTS = round(FINE_PER_DAY * 100)
+    FINE_BLOCK_THRESHOLD_CENTS = round(FINE_BLOCK_THRESHOLD * 100)
 
     def __init__(self) -> None:
         """
@@ -128,15 +222,37 @@ class Library:
             DuplicateBookError: If a book with the same ISBN already exists.
             ValueError: If ISBN is empty.
         """
-        logger.info("addBook called | isbn=%s title=%s", book.isbn, book.title)
+        logger.debug("addBook called | isbn=%s title=%s", book.isbn, book.title)
+        self.addBooks((book,))
 
-        if not book.isbn:
-            raise ValueError("isbn cannot be empty")
-        if book.isbn in self.books:
-            raise DuplicateBookError(f"Book already exists: isbn={book.isbn}")
+    def addBooks(self, books: Iterable[Book]) -> None:
+        """
+        Adds several books to the library in one operation.
 
-        self.books[book.isbn] = book
-        logger.info("Book added successfully | isbn=%s", book.isbn)
+        All books are validated before any is added, so a rejected batch
+        leaves the catalog unchanged.
+
+        Raises:
+            DuplicateBookError: If an ISBN already exists or repeats within the batch.
+            ValueError: If any ISBN is empty.
+        """
+        incoming: Dict[str, Book] = {}
+        for book in books:
+            if not book.isbn:
+                raise ValueError("isbn cannot be empty")
+            # ISBNs are dict keys on every lookup, so share one interned string
+            book.isbn = _intern_key(book.isbn)
+            if book.isbn in incoming:
+                raise DuplicateBookError(f"Duplicate book in batch: isbn={book.isbn}")
+            incoming[book.isbn] = book
+
+        clashes = self.books.keys() & incoming.keys()
+        if clashes:
+            raise DuplicateBookError(f"Book already exists: isbn={', '.join(sorted(clashes))}")
+
+        self.books.update(incoming)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Books added successfully | count=%d", len(incoming))
 
     def registerMember(self, member: Member) -> None:
         """
@@ -146,15 +262,40 @@ class Library:
             DuplicateMemberError: If memberId already exists.
             ValueError: If memberId is empty.
         """
-        logger.info("registerMember called | memberId=%s", member.memberId)
+        logger.debug("registerMember called | memberId=%s", member.memberId)
+        self.registerMembers((member,))
 
-        if not member.memberId:
-            raise ValueError("memberId cannot be empty")
-        if member.memberId in self.members:
-            raise DuplicateMemberError(f"Member already exists: memberId={member.memberId}")
+    def registerMembers(self, members: Iterable[Member]) -> None:
+        """
+        Registers several members in one operation.
 
-        self.members[member.memberId] = member
-        logger.info("Member registered successfully | memberId=%s", member.memberId)
+        All members are validated before any is registered, so a rejected
+        batch leaves the member registry unchanged.
+
+        Raises:
+            DuplicateMemberError: If a memberId already exists or repeats within the batch.
+            ValueError: If any memberId is empty.
+        """
+        incoming: Dict[str, Member] = {}
+        for member in members:
+            if not member.memberId:
+                raise ValueError("memberId cannot be empty")
+            member.memberId = _intern_key(member.memberId)
+            if member.memberId in incoming:
+                raise DuplicateMemberError(
+                    f"Duplicate member in batch: memberId={member.memberId}"
+                )
+            incoming[member.memberId] = member
+
+        clashes = self.members.keys() & incoming.keys()
+        if clashes:
+            raise DuplicateMemberError(
+                f"Member already exists: memberId={', '.join(sorted(clashes))}"
+            )
+
+        self.members.update(incoming)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Members registered successfully | count=%d", len(incoming))
 
     def checkoutBook(
         self,
@@ -165,50 +306,59 @@ class Library:
         """
         Checks out a book to a member.
 
-        Enforces:
+        Enforces (in this order):
+            - book availability
             - max 3 borrowed books
             - unpaid fine threshold
-            - book availability
 
         Raises:
             MemberNotFoundError
             BookNotFoundError
             CheckoutRuleViolationError
         """
-        logger.info("checkoutBook called | memberId=%s isbn=%s", memberId, isbn)
+        logger.debug("checkoutBook called | memberId=%s isbn=%s", memberId, isbn)
 
         member = self._get_member(memberId)
         book = self._get_book(isbn)
+        isbn = book.isbn  # the interned catalog key
 
         if checkout_date is None:
             checkout_date = date.today()
-        self._require_date(checkout_date, "checkout_date")
+        if __debug__:
+            self._require_date(checkout_date, "checkout_date")
 
-        # Update fine before enforcing fine rule
-        self.calculateFine(memberId, on_date=checkout_date)
+        # Rules are checked cheapest first; messages are only built on failure
+        borrowed = member.borrowedBooks
+        n_borrowed = len(borrowed)
 
-        if member.fineBalance > self.FINE_BLOCK_THRESHOLD:
+        if not book.isAvailable:
+            raise CheckoutRuleViolationError(f"Book {isbn} is not available.")
+
+        if n_borrowed >= self.MAX_BORROWED:
             raise CheckoutRuleViolationError(
-                f"Member {memberId} has unpaid fines ${member.fineBalance:.2f} (> $10)."
+                f"Member {memberId} already has {n_borrowed} books."
             )
 
-        if len(member.borrowedBooks) >= self.MAX_BORROWED:
+        # Update fine before enforcing fine rule
+        self.calculateFine(memberId, on_date=checkout_date)
+        if member.fineBalanceCents > self.FINE_BLOCK_THRESHOLD_CENTS:
             raise CheckoutRuleViolationError(
-                f"Member {memberId} already has {len(member.borrowedBooks)} books."
+                f"Member {memberId} has unpaid fines ${member.fineBalance:.2f} "
+                f"(> ${self.FINE_BLOCK_THRESHOLD:g})."
             )
 
-        if not book.isAvailable:
-            raise CheckoutRuleViolationError(f"Book {isbn} is not available.")
-
-        due_date = checkout_date + timedelta(days=self.DUE_DAYS)
+        due_date = checkout_date + self._DUE_DELTA
 
+        rec = BorrowRecord(isbn=isbn, checkoutDate=checkout_date, dueDate=due_date)
         book.isAvailable = False
-        member.borrowedBooks.append(isbn)
-        member._history.append(
-            BorrowRecord(isbn=isbn, checkoutDate=checkout_date, dueDate=due_date)
-        )
+        borrowed[isbn] = rec
+        member._history.append(rec)
+        member._history_view.append(rec._view)
+        if member._min_open_due is None or due_date < member._min_open_due:
+            member._min_open_due = due_date
 
-        logger.info("Checkout successful | memberId=%s isbn=%s", memberId, isbn)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Checkout successful | memberId=%s isbn=%s", memberId, isbn)
 
     def returnBook(
         self,
@@ -229,30 +379,43 @@ class Library:
             MemberNotFoundError
             BookNotFoundError
         """
-        logger.info("returnBook called | memberId=%s isbn=%s", memberId, isbn)
+        logger.debug("returnBook called | memberId=%s isbn=%s", memberId, isbn)
 
         member = self._get_member(memberId)
         book = self._get_book(isbn)
 
         if return_date is None:
             return_date = date.today()
-        self._require_date(return_date, "return_date")
+        if __debug__:
+            self._require_date(return_date, "return_date")
 
         if isbn not in member.borrowedBooks:
             raise CheckoutRuleViolationError(
                 f"Member {memberId} does not have book {isbn} checked out."
             )
 
-        rec = self._find_open_record(member, isbn)
+        rec = member.borrowedBooks[isbn]
         if return_date < rec.checkoutDate:
             raise ValueError("return_date cannot be before checkout_date")
 
         rec.returnDate = return_date
+        rec._view["returnDate"] = return_date
         book.isAvailable = True
-        member.borrowedBooks.remove(isbn)
+        del member.borrowedBooks[isbn]
+        member._min_open_due = min(
+            (r.dueDate for r in member.borrowedBooks.values()), default=None
+        )
+
+        # A returned record's fine is final, so compute it once and fold it in
+        rec.fineCents = max(0, return_date.toordinal() - rec.dueOrdinal) * self.FINE_PER_DAY_CENTS
+        member.closedFineCents += rec.fineCents
 
-        self.calculateFine(memberId, on_date=return_date)
-        logger.info("Return successful | memberId=%s isbn=%s", memberId, isbn)
+        # Closed fines are already settled, so only the open records need pricing
+        member.fineBalanceCents = member.closedFineCents + self._open_fine_cents(
+            member, return_date
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Return successful | memberId=%s isbn=%s", memberId, isbn)
 
     def calculateFine(self, memberId: str, on_date: Optional[date] = None) -> float:
         """
@@ -261,27 +424,40 @@ class Library:
         Fine rule:
             $0.50 per overdue day for each borrow record.
 
+        Fines of returned records are accumulated at return time, so only
+        the open records (at most MAX_BORROWED) are evaluated here.
+
         Returns:
             float: Updated fine balance.
         """
-        logger.info("calculateFine called | memberId=%s", memberId)
+        logger.debug("calculateFine called | memberId=%s", memberId)
 
         member = self._get_member(memberId)
 
         if on_date is None:
             on_date = date.today()
-        self._require_date(on_date, "on_date")
-
-        total = 0.0
-        for rec in member._history:
-            effective_date = rec.returnDate or on_date
-            if effective_date > rec.dueDate:
-                overdue_days = (effective_date - rec.dueDate).days
-                total += overdue_days * self.FINE_PER_DAY
+        if __debug__:
+            self._require_date(on_date, "on_date")
 
-        member.fineBalance = round(total, 2)
+        member.fineBalanceCents = member.closedFineCents + self._open_fine_cents(member, on_date)
         return member.fineBalance
 
+    def recalculateAllFines(self, on_date: Optional[date] = None) -> Dict[str, float]:
+        """
+        Recalculates and updates the fine balance of every member.
+
+        calculateFine is pure Python and holds the GIL, so a plain loop is
+        used; a thread pool was measured slower for the same results.
+
+        Returns:
+            Dict[str, float]: Updated fine balance keyed by memberId.
+        """
+        if on_date is None:
+            on_date = date.today()
+
+        calculate = self.calculateFine
+        return {m: calculate(m, on_date=on_date) for m in self.members}
+
     def getAvailableBooks(self) -> List[Book]:
         """
         Returns all books currently available for checkout.
@@ -297,17 +473,12 @@ class Library:
             - checkoutDate
             - dueDate
             - returnDate
+
+        The entries are cached per record and shared between calls, so
+        callers should treat them as read-only.
         """
         member = self._get_member(memberId)
-        return [
-            {
-                "isbn": rec.isbn,
-                "checkoutDate": rec.checkoutDate,
-                "dueDate": rec.dueDate,
-                "returnDate": rec.returnDate,
-            }
-            for rec in member._history
-        ]
+        return list(member._history_view)
 
     # Internal Helpers
     def _get_book(self, isbn: str) -> Book:
@@ -326,26 +497,31 @@ class Library:
             raise MemberNotFoundError(f"Member not found: memberId={memberId}")
         return self.members[memberId]
 
+    def _open_fine_cents(self, member: Member, on_date: date) -> int:
+        """
+        Returns the fine in cents accrued by the member's open records as of on_date.
+        """
+        # Nothing open is overdue yet
+        if member._min_open_due is None or on_date <= member._min_open_due:
+            return 0
+
+        return _sum_open_fines(
+            [rec.dueOrdinal for rec in member.borrowedBooks.values()],
+            on_date.toordinal(),
+            self.FINE_PER_DAY_CENTS,
+        )
+
     @staticmethod
     def _require_date(d: date, name: str) -> None:
         """
         Validates that the provided value is a datetime.date.
+
+        Call sites are wrapped in ``if __debug__:`` so the check is
+        compiled out when running under ``python -O``.
         """
         if not isinstance(d, date):
             raise ValueError(f"{name} must be a datetime.date")
 
-    @staticmethod
-    def _find_open_record(member: Member, isbn: str) -> BorrowRecord:
-        """
-        Finds the active (not returned) borrow record for a given ISBN.
-        """
-        for rec in reversed(member._history):
-            if rec.isbn == isbn and rec.is_open():
-                return rec
-        raise CheckoutRuleViolationError(
-            f"No active borrow record for memberId={member.memberId}, isbn={isbn}"
-        )
-
 
 
 # Main Program
@@ -368,8 +544,6 @@ def main() -> None:
         - overdue fine calculation
         - viewing borrowing history
     """
-    from datetime import date
-
     print("\n=== Library Book Checkout System Demo ===\n")
 
     library = Library()
@@ -1,7 +1,7 @@
 import pytest
 from datetime import date
 
-from library_system import Library, Book, Member
+from library_system import Library, Book, Member, _parse_log_level
 from exceptions import (
     BookNotFoundError,
     MemberNotFoundError,
@@ -34,6 +34,37 @@ def test_add_book_duplicate_raises(lib):
         lib.addBook(Book("111", "Duplicate", "Someone"))
 
 
+def test_add_books_bulk(lib):
+    lib.addBooks([
+        Book("555", "The Pragmatic Programmer", "Andrew Hunt"),
+        Book("666", "Code Complete", "Steve McConnell"),
+    ])
+    assert {"555", "666"} <= set(lib.books)
+    assert {"555", "666"} <= {b.isbn for b in lib.getAvailableBooks()}
+
+
+def test_add_books_duplicate_leaves_catalog_unchanged(lib):
+    with pytest.raises(DuplicateBookError):
+        lib.addBooks([Book("555", "New", "Someone"), Book("111", "Duplicate", "Someone")])
+    assert "555" not in lib.books
+
+    with pytest.raises(DuplicateBookError):
+        lib.addBooks([Book("777", "A", "X"), Book("777", "B", "Y")])
+    assert "777" not in lib.books
+
+
+def test_add_book_accepts_non_exact_str_keys(lib):
+    class Isbn(str):
+        pass
+
+    lib.addBook(Book(Isbn("555"), "Subclassed Key", "Someone"))
+    lib.addBook(Book(666, "Integer Key", "Someone"))
+    lib.registerMember(Member(Isbn("M2"), "Alex"))
+    lib.checkoutBook("M2", "555", checkout_date=date(2025, 1, 1))
+    lib.checkoutBook("M2", 666, checkout_date=date(2025, 1, 1))
+    assert set(lib.members["M2"].borrowedBooks) == {"555", 666}
+
+
 def test_register_member_success(lib):
     lib.registerMember(Member("M2", "Alex"))
     assert "M2" in lib.members
@@ -44,6 +75,15 @@ def test_register_member_duplicate_raises(lib):
         lib.registerMember(Member("M1", "Duplicate Name"))
 
 
+def test_register_members_bulk_duplicate_raises(lib):
+    lib.registerMembers([Member("M2", "Alex"), Member("M3", "Sam")])
+    assert {"M2", "M3"} <= set(lib.members)
+
+    with pytest.raises(DuplicateMemberError):
+        lib.registerMembers([Member("M4", "Kim"), Member("M1", "Duplicate Name")])
+    assert "M4" not in lib.members
+
+
 def test_checkout_book_not_found(lib):
     with pytest.raises(BookNotFoundError):
         lib.checkoutBook("M1", "999", checkout_date=date(2025, 1, 1))
@@ -172,6 +212,32 @@ def test_getAvailableBooks_updates_correctly(lib):
     assert set(b.isbn for b in lib.getAvailableBooks()) == {"222", "333", "444"}
 
 
+def test_getAvailableBooks_keeps_catalog_order_after_return(lib):
+    lib.checkoutBook("M1", "111", checkout_date=date(2025, 1, 1))
+    lib.returnBook("M1", "111", return_date=date(2025, 1, 5))
+    assert [b.isbn for b in lib.getAvailableBooks()] == ["111", "222", "333", "444"]
+
+
+def test_isAvailable_is_the_single_source_of_availability(lib):
+    book = lib.books["333"]
+    other = Library()
+    other.addBook(Book("999", "Filler", "Someone"))
+    other.addBook(book)  # the same physical copy in a second library
+    other.registerMember(Member("M9", "Sam"))
+
+    lib.checkoutBook("M1", "333", checkout_date=date(2025, 1, 1))
+    assert [b.isbn for b in lib.getAvailableBooks()] == ["111", "222", "444"]
+    assert [b.isbn for b in other.getAvailableBooks()] == ["999"]
+    with pytest.raises(CheckoutRuleViolationError):
+        other.checkoutBook("M9", "333", checkout_date=date(2025, 1, 2))
+
+    # Writes to the flag are honored by both listing and checkout
+    lib.books["222"].isAvailable = False
+    assert [b.isbn for b in lib.getAvailableBooks()] == ["111", "444"]
+    with pytest.raises(CheckoutRuleViolationError):
+        lib.checkoutBook("M1", "222", checkout_date=date(2025, 1, 2))
+
+
 def test_getMemberBorrowingHistory_member_not_found(lib):
     with pytest.raises(MemberNotFoundError):
         lib.getMemberBorrowingHistory("M999")
@@ -191,3 +257,73 @@ def test_history_contains_multiple_records(lib):
     open_rec = [h for h in hist if h["isbn"] == "222"][0]
     assert returned["returnDate"] == date(2025, 1, 10)
     assert open_rec["returnDate"] is None
+
+
+def test_fine_combines_returned_and_open_records(lib):
+    """
+    Both checked out Jan 1, due Jan 15.
+    111 returned Jan 20 => 5 days => 2.50 (final)
+    222 still open on Jan 20 => 2.50, on Jan 25 => 10 days => 5.00
+    """
+    d0 = date(2025, 1, 1)
+    lib.checkoutBook("M1", "111", checkout_date=d0)
+    lib.checkoutBook("M1", "222", checkout_date=d0)
+    lib.returnBook("M1", "111", return_date=date(2025, 1, 20))
+    assert lib.members["M1"].fineBalance == 5.00
+
+    assert lib.calculateFine("M1", on_date=date(2025, 1, 25)) == 7.50
+
+
+def test_returned_record_keeps_final_fine(lib):
+    lib.checkoutBook("M1", "111", checkout_date=date(2025, 1, 1))
+    lib.returnBook("M1", "111", return_date=date(2025, 1, 20))
+
+    rec = lib.members["M1"]._history[0]
+    assert rec.fineCents == 250
+    # A later as-of date must not grow the fine of a returned book
+    assert lib.calculateFine("M1", on_date=date(2025, 3, 1)) == 2.50
+
+
+def test_recalculateAllFines_updates_every_member(lib):
+    lib.registerMember(Member("M2", "Alex"))
+    lib.registerMember(Member("M3", "Sam"))
+    d0 = date(2025, 1, 1)  # due Jan 15
+    lib.checkoutBook("M1", "111", checkout_date=d0)
+    lib.checkoutBook("M2", "222", checkout_date=d0)
+
+    fines = lib.recalculateAllFines(on_date=date(2025, 1, 19))
+    assert fines == {"M1": 2.00, "M2": 2.00, "M3": 0.0}
+    assert lib.members["M2"].fineBalance == 2.00
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("DEBUG", 10),
+        ("info", 20),
+        (" 10 ", 10),
+        ("verbose", None),
+        ("", None),
+        ("\u00b2", None),  # superscript two: isdigit() but not int()
+    ],
+)
+def test_parse_log_level(value, expected):
+    assert _parse_log_level(value) == expected
+
+
+def test_fineBalance_property_and_keyword_only_cents():
+    m = Member("M5", "Kim", fineBalanceCents=150)
+    assert m.fineBalance == 1.50
+    m.fineBalance = 2.25
+    assert m.fineBalanceCents == 225
+    # The old positional dollar argument is rejected rather than read as cents
+    with pytest.raises(TypeError):
+        Member("M6", "Lee", {}, 2.50)
+
+
+def test_member_caches_are_not_constructor_arguments():
+    with pytest.raises(TypeError):
+        Member("M7", "Ray", closedFineCents=100)
+    with pytest.raises(TypeError):
+        Member("M7", "Ray", _history_view=[{}])
+    assert "_history_view" not in repr(Member("M7", "Ray"))
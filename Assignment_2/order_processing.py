@@ -2,11 +2,20 @@ from __future__ import annotations
 
 import argparse
 import logging
-from dataclasses import dataclass
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+from functools import partial
+from itertools import groupby, repeat
+from math import gcd
+from operator import mul
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from sys import intern
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 
 from exception import InputFileError, OutputFileError, RecordParseError
 
@@ -23,15 +32,54 @@ if not logger.handlers:
 MONEY_Q = Decimal("0.01")
 DISCOUNT_RATE = Decimal("0.10")
 DISCOUNT_THRESHOLD = Decimal("500.00")  # apply discount if TOTAL > 500
+# Integer-cent equivalents used by the arithmetic hot paths, derived from the
+# Decimal rules above. Line totals are whole cents, so "> threshold" only
+# needs the threshold's whole-cent floor.
+DISCOUNT_THRESHOLD_CENTS = int(DISCOUNT_THRESHOLD.scaleb(2))
+# Quantity and unit-price cents are stored in array('q') (int64) columns
+MAX_INT64 = (1 << 63) - 1
+IO_BUFFER_SIZE = 1 << 20  # 1 MiB buffers for streamed input/error files
+PARALLEL_CHUNK_SIZE = 64 << 20  # 64 MiB of input per parse worker
 
 
 def money(x: Decimal) -> Decimal:
+    # Only used on cold paths (slow parser, directly built records);
+    # hot paths stay in integer cents, see discount_cents_for.
     return x.quantize(MONEY_Q, rounding=ROUND_HALF_UP)
 
 
+def _half_up_rate(rate: Decimal) -> Tuple[int, int, int]:
+    """
+    Returns (mul, add, div) such that (n * mul + add) // div is n * rate
+    rounded half-up, exactly, for any non-negative int n.
+    """
+    num, den = rate.as_integer_ratio()
+    # floor(n * num / den + 1/2) == (2 * num * n + den) // (2 * den); divide
+    # out the common factor (den divides 2 * den, so gcd(2 * num, den) is it)
+    g = gcd(2 * num, den)
+    return 2 * num // g, den // g, 2 * den // g
+
+
+# For the 10% rate this is (1, 5, 10), i.e. (n + 5) // 10
+_DISCOUNT_MUL, _DISCOUNT_ADD, _DISCOUNT_DIV = _half_up_rate(DISCOUNT_RATE)
+
+
+def decimal_from_cents(cents: int) -> Decimal:
+    # Exact conversion: Decimal(12345).scaleb(-2) == Decimal("123.45")
+    return Decimal(cents).scaleb(-2)
+
+
+def discount_cents_for(line_total_cents: int) -> int:
+    # DISCOUNT_RATE of the line total, rounded half-up to whole cents.
+    # This is the discount rule; _aggregate and _aggregate_runs inline it.
+    if line_total_cents > DISCOUNT_THRESHOLD_CENTS:
+        return (line_total_cents * _DISCOUNT_MUL + _DISCOUNT_ADD) // _DISCOUNT_DIV
+    return 0
+
+
 
 # Data Models
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class OrderRecord:
     order_id: str
     customer_name: str
@@ -39,25 +87,101 @@ class OrderRecord:
     quantity: int
     unit_price: Decimal
     order_date: date
+    # unit_price in integer cents; all totals are computed from this.
+    # Derived from unit_price unless the parser already knows it.
+    unit_price_cents: int = field(default=-1, repr=False, compare=False)
+    # Totals in integer cents, computed once in __post_init__
+    line_total_cents: int = field(init=False, repr=False, compare=False)
+    discount_cents: int = field(init=False, repr=False, compare=False)
+    net_total_cents: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        price_cents = self.unit_price_cents
+        if price_cents < 0:
+            price_cents = int(money(self.unit_price) * 100)
+            object.__setattr__(self, "unit_price_cents", price_cents)
+
+        line_total = self.quantity * price_cents
+        # Requirement (3): 10% discount for orders with line totals over $500
+        # Interpreted as: if THIS line_total > 500, discount applies to THIS line.
+        discount = discount_cents_for(line_total)
+        object.__setattr__(self, "line_total_cents", line_total)
+        object.__setattr__(self, "discount_cents", discount)
+        object.__setattr__(self, "net_total_cents", line_total - discount)
 
     @property
     def line_total(self) -> Decimal:
-        return money(Decimal(self.quantity) * self.unit_price)
+        return decimal_from_cents(self.line_total_cents)
 
     @property
     def discount(self) -> Decimal:
-        # Requirement (3): 10% discount for orders with line totals over $500
-        # Interpreted as: if THIS line_total > 500, discount applies to THIS line.
-        if self.line_total > DISCOUNT_THRESHOLD:
-            return money(self.line_total * DISCOUNT_RATE)
-        return Decimal("0.00")
+        return decimal_from_cents(self.discount_cents)
 
     @property
     def net_total(self) -> Decimal:
-        return money(self.line_total - self.discount)
+        return decimal_from_cents(self.net_total_cents)
 
 
 @dataclass
+class OrdersTable:
+    """
+    Column-oriented storage for parsed orders: row i is made of the i-th
+    entry of every column. Integer columns are array('q') buffers, so they
+    hold raw int64 values instead of one Python int object per row.
+    Order dates are stored the same way, as proleptic Gregorian ordinals
+    (date.toordinal()), and only turned back into date objects by row().
+    """
+    order_ids: List[str] = field(default_factory=list)
+    customers: List[str] = field(default_factory=list)
+    products: List[str] = field(default_factory=list)
+    quantities: array = field(default_factory=lambda: array("q"))
+    unit_price_cents: array = field(default_factory=lambda: array("q"))
+    order_date_ordinals: array = field(default_factory=lambda: array("q"))
+
+    @classmethod
+    def from_records(cls, records: Iterable[OrderRecord]) -> OrdersTable:
+        table = cls()
+        for r in records:
+            table.append(r)
+        return table
+
+    def append(self, r: OrderRecord) -> None:
+        self.order_ids.append(r.order_id)
+        self.customers.append(r.customer_name)
+        self.products.append(r.product_name)
+        self.quantities.append(r.quantity)
+        self.unit_price_cents.append(r.unit_price_cents)
+        self.order_date_ordinals.append(r.order_date.toordinal())
+
+    def extend(self, other: OrdersTable) -> None:
+        self.order_ids.extend(other.order_ids)
+        self.customers.extend(map(intern, other.customers))
+        self.products.extend(map(intern, other.products))
+        self.quantities.extend(other.quantities)
+        self.unit_price_cents.extend(other.unit_price_cents)
+        self.order_date_ordinals.extend(other.order_date_ordinals)
+
+    def row(self, i: int) -> OrderRecord:
+        cents = self.unit_price_cents[i]
+        return OrderRecord(
+            order_id=self.order_ids[i],
+            customer_name=self.customers[i],
+            product_name=self.products[i],
+            quantity=self.quantities[i],
+            unit_price=decimal_from_cents(cents),
+            order_date=date.fromordinal(self.order_date_ordinals[i]),
+            unit_price_cents=cents,
+        )
+
+    def __len__(self) -> int:
+        return len(self.order_ids)
+
+    def __iter__(self) -> Iterator[OrderRecord]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+
+@dataclass(slots=True)
 class CustomerSummary:
     customer_name: str
     num_orders: int
@@ -69,6 +193,21 @@ class CustomerSummary:
 
 
 # Parsing / Validation
+
+# Fast path for well-formed lines: text fields are non-empty with no
+# surrounding whitespace, quantity/price are plain ASCII digits with at most
+# two decimals, and the date is YYYY-MM-DD. Anything else (including lines
+# that match but fail validation) goes through the slow path, which
+# produces the precise error message.
+_TEXT = r"\s*([^|\s](?:[^|]*[^|\s])?)\s*"
+_ORDER_RE = re.compile(
+    rf"{_TEXT}\|{_TEXT}\|{_TEXT}"
+    r"\|\s*([0-9]+)\s*"
+    r"\|\s*([0-9]+)(?:\.([0-9]{1,2}))?\s*"
+    r"\|\s*([0-9]{4})-([0-9]{2})-([0-9]{2})\s*"
+)
+
+
 def parse_order_line(line: str) -> OrderRecord:
     """
     Expected format:
@@ -76,6 +215,38 @@ def parse_order_line(line: str) -> OrderRecord:
 
     Example:
       ORD001|John Smith|Laptop|2|999.99|2024-03-15
+
+    Customer and product names are interned: they repeat across many
+    lines, so all records share one string object per distinct name.
+    """
+    m = _ORDER_RE.fullmatch(line)
+    if m is not None:
+        order_id, customer, product, qty_s, int_s, frac_s, y, mo, d = m.groups()
+        qty = int(qty_s)
+        price_cents = int(int_s) * 100 + (int(frac_s.ljust(2, "0")) if frac_s else 0)
+        if 0 < qty <= MAX_INT64 and 0 < price_cents <= MAX_INT64:
+            try:
+                od = date(int(y), int(mo), int(d))
+            except ValueError:
+                pass
+            else:
+                return OrderRecord(
+                    order_id=order_id,
+                    customer_name=intern(customer),
+                    product_name=intern(product),
+                    quantity=qty,
+                    unit_price=decimal_from_cents(price_cents),
+                    order_date=od,
+                    unit_price_cents=price_cents,
+                )
+
+    return _parse_order_line_slow(line)
+
+
+def _parse_order_line_slow(line: str) -> OrderRecord:
+    """
+    General parser with field-level validation; raises RecordParseError
+    describing the first problem found.
     """
     parts = [p.strip() for p in line.strip().split("|")]
     if len(parts) != 6:
@@ -96,6 +267,8 @@ def parse_order_line(line: str) -> OrderRecord:
         raise RecordParseError(f"Invalid Quantity: {qty_s!r}")
     if qty <= 0:
         raise RecordParseError(f"Quantity must be positive (got {qty})")
+    if qty > MAX_INT64:
+        raise RecordParseError(f"Quantity is too large (got {qty})")
 
     try:
         unit_price = Decimal(price_s)
@@ -103,23 +276,38 @@ def parse_order_line(line: str) -> OrderRecord:
         raise RecordParseError(f"Invalid UnitPrice: {price_s!r}")
     if unit_price <= 0:
         raise RecordParseError(f"UnitPrice must be positive (got {unit_price})")
+    if unit_price.scaleb(2) > MAX_INT64:
+        raise RecordParseError(f"UnitPrice is too large (got {unit_price})")
     unit_price = money(unit_price)
 
-    try:
-        od = date.fromisoformat(date_s)
-    except Exception:
-        raise RecordParseError(f"Invalid OrderDate (expected YYYY-MM-DD): {date_s!r}")
+    od = _fast_date(date_s)
 
     return OrderRecord(
         order_id=order_id,
-        customer_name=customer,
-        product_name=product,
+        customer_name=intern(customer),
+        product_name=intern(product),
         quantity=qty,
         unit_price=unit_price,
         order_date=od,
+        # Already quantized, so __post_init__ need not round it again
+        unit_price_cents=int(unit_price.scaleb(2)),
     )
 
 
+def _fast_date(s: str) -> date:
+    """
+    Parses a strict YYYY-MM-DD date with slices and int(); unlike
+    date.fromisoformat it does not accept other ISO 8601 forms (e.g. 20240315).
+    """
+    digits = s[0:4] + s[5:7] + s[8:10]
+    if len(s) != 10 or s[4] != "-" or s[7] != "-" or not (digits.isascii() and digits.isdigit()):
+        raise RecordParseError(f"Invalid OrderDate (expected YYYY-MM-DD): {s!r}")
+    try:
+        return date(int(s[0:4]), int(s[5:7]), int(s[8:10]))
+    except ValueError:
+        raise RecordParseError(f"Invalid OrderDate (expected YYYY-MM-DD): {s!r}")
+
+
 def read_orders(input_path: str | Path, error_path: str | Path) -> List[OrderRecord]:
     """
     Requirement (1): Parse the input file and handle malformed records
@@ -129,52 +317,234 @@ def read_orders(input_path: str | Path, error_path: str | Path) -> List[OrderRec
     - Malformed lines are written to error file with reason + raw content.
     - Empty input file returns empty orders list and creates an empty error file.
     """
+    return list(iter_orders(input_path, error_path))
+
+
+def read_orders_table(input_path: str | Path, error_path: str | Path) -> OrdersTable:
+    """
+    Same as read_orders, but stores the valid records column-wise in an
+    OrdersTable instead of a list of OrderRecord objects.
+    """
+    return OrdersTable.from_records(iter_orders(input_path, error_path))
+
+
+@contextmanager
+def _open_error_file(error_path: Path) -> Iterator[TextIO]:
+    """
+    Opens the error file for streamed writes. The file is buffered, so a
+    failed write often only surfaces when it is flushed on close; both the
+    open and the final close raise OutputFileError.
+    """
+    try:
+        ferr = open(error_path, "w", encoding="utf-8", buffering=IO_BUFFER_SIZE)
+    except Exception as e:
+        logger.error("Cannot write error file | %s", e)
+        raise OutputFileError(f"Cannot write error file: {error_path}") from e
+
+    try:
+        yield ferr
+    except BaseException:
+        # Already failing: a flush error on close would only mask the cause
+        with suppress(Exception):
+            ferr.close()
+        raise
+
+    try:
+        ferr.close()
+    except Exception as e:
+        logger.error("Cannot write error file | %s", e)
+        raise OutputFileError(f"Cannot write error file: {error_path}") from e
+
+
+def iter_orders(input_path: str | Path, error_path: str | Path) -> Iterator[OrderRecord]:
+    """
+    Streams valid records from the input file, writing malformed lines to
+    the error file as they are encountered (see read_orders).
+    """
     input_path = Path(input_path)
     error_path = Path(error_path)
 
     logger.info("Reading input file | %s", input_path)
 
+    # Both files are streamed line by line, so memory stays bounded to the
+    # parsed records rather than the raw file text.
     try:
-        text = input_path.read_text(encoding="utf-8")
+        fin = open(input_path, "r", encoding="utf-8", buffering=IO_BUFFER_SIZE)
     except Exception as e:
         logger.exception("Cannot read input file | %s", e)
         raise InputFileError(f"Cannot read input file: {input_path}") from e
 
-    lines = [ln for ln in text.splitlines() if ln.strip() != ""]
-    if not lines:
-        # Edge case: empty file
+    n_valid = 0
+    n_lines = 0
+    n_errors = 0
+    # Malformed lines are only logged individually at DEBUG; the error file
+    # has the details and a single ERROR summary is logged at the end.
+    debug = logger.isEnabledFor(logging.DEBUG)
+
+    with fin, _open_error_file(error_path) as ferr:
         try:
-            error_path.write_text("", encoding="utf-8")
-        except Exception as e:
-            raise OutputFileError(f"Cannot write error file: {error_path}") from e
+            # splitlines() also breaks on \x0b, \x0c, \x1c-\x1e, \x85,
+            # \u2028 and \u2029, which file iteration does not; splitting
+            # each line keeps the numbering of splitting the whole text.
+            for file_line in fin:
+                for raw in file_line.splitlines():
+                    if raw.strip() == "":
+                        continue
+                    # Line numbers count non-blank lines only
+                    n_lines += 1
+                    try:
+                        rec = parse_order_line(raw)
+                    except RecordParseError as e:
+                        msg = f"Line {n_lines}: {e} | RAW={raw}"
+                        if debug:
+                            logger.debug("Malformed record | %s", msg)
+                        n_errors += 1
+                        try:
+                            ferr.write(msg + "\n")
+                        except Exception as we:
+                            logger.error("Cannot write error file | %s", we)
+                            raise OutputFileError(
+                                f"Cannot write error file: {error_path}"
+                            ) from we
+                    else:
+                        n_valid += 1
+                        yield rec
+        except (OSError, UnicodeDecodeError) as e:
+            logger.exception("Cannot read input file | %s", e)
+            raise InputFileError(f"Cannot read input file: {input_path}") from e
+
+    if n_lines == 0:
+        # Edge case: empty file (the error file was truncated on open)
         logger.error("Input file is empty | %s", input_path)
-        return []
+        return
 
-    valid: List[OrderRecord] = []
-    errors: List[str] = []
+    logger.info("Parsed records | valid=%d malformed=%d", n_valid, n_errors)
+    if n_errors:
+        logger.error("Malformed records | count=%d (see %s)", n_errors, error_path)
 
-    for idx, raw in enumerate(lines, start=1):
-        try:
-            rec = parse_order_line(raw)
-            valid.append(rec)
-        except RecordParseError as e:
-            msg = f"Line {idx}: {e} | RAW={raw}"
-            logger.error("Malformed record | %s", msg)
-            errors.append(msg)
+
+def read_orders_parallel(
+    input_path: str | Path,
+    error_path: str | Path,
+    max_workers: Optional[int] = None,
+    chunk_size: int = PARALLEL_CHUNK_SIZE,
+) -> OrdersTable:
+    """
+    Parallel variant of read_orders_table for large inputs.
+
+    The file is split into ~chunk_size byte ranges that end on line breaks,
+    and each range is parsed in a worker process. Results are merged in file
+    order, so the table and the error file (including line numbers) match
+    read_orders_table. Inputs that fit in a single chunk are parsed in-process.
+    """
+    input_path = Path(input_path)
+    error_path = Path(error_path)
 
     try:
-        error_path.write_text("\n".join(errors) + ("\n" if errors else ""), encoding="utf-8")
+        bounds = _chunk_bounds(input_path, chunk_size)
     except Exception as e:
-        logger.error("Cannot write error file | %s", e)
-        raise OutputFileError(f"Cannot write error file: {error_path}") from e
+        logger.exception("Cannot read input file | %s", e)
+        raise InputFileError(f"Cannot read input file: {input_path}") from e
 
-    logger.info("Parsed records | valid=%d malformed=%d", len(valid), len(errors))
-    return valid
+    if len(bounds) <= 1:
+        return read_orders_table(input_path, error_path)
+
+    logger.info("Reading input file | %s (%d chunks)", input_path, len(bounds))
+
+    table = OrdersTable()
+    n_lines = 0
+    n_errors = 0
+    debug = logger.isEnabledFor(logging.DEBUG)
+    starts = [b[0] for b in bounds]
+    ends = [b[1] for b in bounds]
+
+    with (
+        _open_error_file(error_path) as ferr,
+        ProcessPoolExecutor(max_workers=max_workers) as pool,
+    ):
+        try:
+            results = pool.map(_parse_chunk, repeat(str(input_path)), starts, ends)
+            for chunk, errors, chunk_lines in results:
+                table.extend(chunk)
+                for idx, reason, raw in errors:
+                    msg = f"Line {n_lines + idx}: {reason} | RAW={raw}"
+                    if debug:
+                        logger.debug("Malformed record | %s", msg)
+                    try:
+                        ferr.write(msg + "\n")
+                    except Exception as we:
+                        logger.error("Cannot write error file | %s", we)
+                        raise OutputFileError(f"Cannot write error file: {error_path}") from we
+                n_errors += len(errors)
+                n_lines += chunk_lines
+        except (OSError, UnicodeDecodeError) as e:
+            logger.exception("Cannot read input file | %s", e)
+            raise InputFileError(f"Cannot read input file: {input_path}") from e
+
+    if n_lines == 0:
+        logger.error("Input file is empty | %s", input_path)
+    else:
+        logger.info("Parsed records | valid=%d malformed=%d", len(table), n_errors)
+        if n_errors:
+            logger.error("Malformed records | count=%d (see %s)", n_errors, error_path)
+    return table
+
+
+def _chunk_bounds(path: Path, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Splits the file into (start, end) byte ranges of about chunk_size bytes,
+    each ending just after a newline (or at EOF).
+    """
+    size = path.stat().st_size
+    starts = [0]
+    with open(path, "rb") as f:
+        pos = chunk_size
+        while pos < size:
+            f.seek(pos)
+            f.readline()  # move to the start of the next line
+            boundary = f.tell()
+            if boundary >= size:
+                break
+            starts.append(boundary)
+            pos = boundary + chunk_size
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def _parse_chunk(
+    path: str, start: int, end: int
+) -> Tuple[OrdersTable, List[Tuple[int, str, str]], int]:
+    """
+    Worker for read_orders_parallel: parses one byte range of the file.
+
+    Mirrors the loop in iter_orders, but returns the errors as
+    (chunk-local non-blank line number, reason, raw line) so the parent can
+    renumber them, along with the number of non-blank lines seen.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+
+    table = OrdersTable()
+    errors: List[Tuple[int, str, str]] = []
+    n_lines = 0
+    # Chunks end on "\n", so splitting each one gives the same lines as
+    # splitlines() on the whole file (see iter_orders)
+    for raw in text.splitlines():
+        if raw.strip() == "":
+            continue
+        n_lines += 1
+        try:
+            table.append(parse_order_line(raw))
+        except RecordParseError as e:
+            errors.append((n_lines, str(e), raw))
+    return table, errors, n_lines
 
 
 
 # Aggregation
-def summarize_by_customer(records: List[OrderRecord]) -> List[CustomerSummary]:
+def summarize_by_customer(
+    records: Iterable[OrderRecord] | OrdersTable,
+) -> List[CustomerSummary]:
     """
     Requirement (4): Grouped by customer showing:
       - customer name
@@ -184,66 +554,218 @@ def summarize_by_customer(records: List[OrderRecord]) -> List[CustomerSummary]:
       - discount amount (sum discounts)
       - net total (gross - discount)
     """
-    # customer -> set(order_ids), totals
-    temp: Dict[str, Dict[str, object]] = {}
-
-    for r in records:
-        entry = temp.setdefault(
-            r.customer_name,
-            {
-                "order_ids": set(),
-                "total_items": 0,
-                "gross": Decimal("0.00"),
-                "discount": Decimal("0.00"),
-            },
+    if isinstance(records, OrdersTable):
+        return _aggregate_columns(
+            records.customers,
+            records.order_ids,
+            partial(_aggregate, records.quantities, records.unit_price_cents),
         )
-        entry["order_ids"].add(r.order_id)
-        entry["total_items"] += r.quantity
-        entry["gross"] += r.line_total
-        entry["discount"] += r.discount
+    # The record path reads the input several times, so a one-shot iterable
+    # (e.g. iter_orders) is materialized first.
+    if not isinstance(records, Sequence):
+        records = list(records)
+    # Records already carry their cent totals, so sum those directly rather
+    # than recomputing quantity * price and the discount per row.
+    return _aggregate_columns(
+        [r.customer_name for r in records],
+        [r.order_id for r in records],
+        partial(_aggregate_records, records),
+    )
 
-    summaries: List[CustomerSummary] = []
-    for customer, v in temp.items():
-        gross = money(v["gross"])
-        discount = money(v["discount"])
-        net = money(gross - discount)
 
+def _aggregate_columns(
+    customers: Sequence[str],
+    order_ids: Sequence[str],
+    aggregate: Callable[
+        [List[int], int, Optional[List[int]]], Tuple[List[int], List[int], List[int]]
+    ],
+) -> List[CustomerSummary]:
+    """
+    Column-wise groupby behind summarize_by_customer.
+
+    Customers are dictionary-encoded to dense group ids, the money totals
+    are reduced by aggregate(group_id, n_groups, offsets) (an integer kernel
+    such as _aggregate), and distinct order ids are counted per group.
+    """
+    names, group_id, offsets = _group_ids(customers)
+    n_groups = len(names)
+    gross, discount, items = aggregate(group_id, n_groups, offsets)
+
+    if offsets is not None:
+        # Each group is one contiguous slice: build its set in a single call
+        num_orders = [
+            len(set(order_ids[offsets[g]:offsets[g + 1]])) for g in range(n_groups)
+        ]
+    else:
+        # One set of order ids per group, reached by group id rather than by
+        # customer name. A single shared set of (group, order_id) tuples was
+        # measured slower: it allocates a tuple per row and grows one large table.
+        order_sets: List[set] = [set() for _ in range(n_groups)]
+        add_order = [ids.add for ids in order_sets]
+        for g, order_id in zip(group_id, order_ids):
+            add_order[g](order_id)
+        num_orders = [len(ids) for ids in order_sets]
+
+    # Sort the group ids rather than the finished summaries, then build each
+    # summary straight from the per-group lists. sorted() is stable, so ties
+    # keep first-seen order exactly as sorting the summaries would.
+    sort_keys = [name.lower() for name in names]
+    summaries: List[CustomerSummary] = []
+    for g in sorted(range(n_groups), key=sort_keys.__getitem__):
+        gross_cents = gross[g]
+        discount_cents = discount[g]
         summaries.append(
             CustomerSummary(
-                customer_name=customer,
-                num_orders=len(v["order_ids"]),
-                total_items=int(v["total_items"]),
-                gross_total=gross,
-                discount_total=discount,
-                net_total=net,
+                customer_name=names[g],
+                num_orders=num_orders[g],
+                total_items=items[g],
+                gross_total=decimal_from_cents(gross_cents),
+                discount_total=decimal_from_cents(discount_cents),
+                net_total=decimal_from_cents(gross_cents - discount_cents),
             )
         )
-
-    summaries.sort(key=lambda s: s.customer_name.lower())
     return summaries
 
 
+def _group_ids(keys: Sequence[str]) -> Tuple[List[str], List[int], Optional[List[int]]]:
+    """
+    Dictionary-encodes keys: returns the distinct keys in first-seen order,
+    for every input row the index of its key in that list, and, when every
+    key forms a single contiguous run, the run offsets (group g is rows
+    offsets[g]:offsets[g + 1]); otherwise None.
+    """
+    # Clustered input (e.g. a feed sorted by customer) is one contiguous run
+    # per key, so ids can be assigned per run with one hash probe per run
+    # instead of per row. Bail out as soon as a key reappears.
+    codes: Dict[str, int] = {}
+    group_id: List[int] = []
+    offsets = [0]
+    for k, run in groupby(keys):
+        if k in codes:
+            break
+        g = codes[k] = len(codes)
+        group_id.extend([g] * len(list(run)))
+        offsets.append(len(group_id))
+    else:
+        return list(codes), group_id, offsets
+
+    codes = {}
+    group_id = [codes.setdefault(k, len(codes)) for k in keys]
+    return list(codes), group_id, None
+
+
+def _aggregate(
+    quantities: Sequence[int],
+    unit_price_cents: Sequence[int],
+    group_id: Sequence[int],
+    n_groups: int,
+    offsets: Optional[List[int]] = None,
+) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Integer-only per-group reduction: returns (gross_cents, discount_cents,
+    items) indexed by group id. discount_cents_for is inlined (a call per
+    row was measured ~40% slower); test_all_aggregation_paths_apply_discount_cents_for
+    keeps the copies in step.
+    """
+    if offsets is not None:
+        return _aggregate_runs(quantities, unit_price_cents, offsets)
+
+    # Plain lists are used as accumulators: array('q') was measured slower
+    # here, since every += boxes and unboxes the element.
+    gross = [0] * n_groups
+    discount = [0] * n_groups
+    items = [0] * n_groups
+    threshold = DISCOUNT_THRESHOLD_CENTS
+    d_mul, d_add, d_div = _DISCOUNT_MUL, _DISCOUNT_ADD, _DISCOUNT_DIV
+    for qty, price, g in zip(quantities, unit_price_cents, group_id):
+        lt = qty * price
+        gross[g] += lt
+        items[g] += qty
+        if lt > threshold:
+            discount[g] += (lt * d_mul + d_add) // d_div  # discount_cents_for, inlined
+    return gross, discount, items
+
+
+def _aggregate_runs(
+    quantities: Sequence[int],
+    unit_price_cents: Sequence[int],
+    offsets: List[int],
+) -> Tuple[List[int], List[int], List[int]]:
+    """
+    _aggregate for clustered input, where group g is the contiguous slice
+    offsets[g]:offsets[g + 1]. Products and sums over each slice run as
+    C-level map()/sum() calls (a segment reduction) instead of one Python
+    loop iteration per row.
+    """
+    gross: List[int] = []
+    discount: List[int] = []
+    items: List[int] = []
+    threshold = DISCOUNT_THRESHOLD_CENTS
+    d_mul, d_add, d_div = _DISCOUNT_MUL, _DISCOUNT_ADD, _DISCOUNT_DIV
+    for start, end in zip(offsets, offsets[1:]):
+        qty = quantities[start:end]
+        line_totals = list(map(mul, qty, unit_price_cents[start:end]))
+        gross.append(sum(line_totals))
+        items.append(sum(qty))
+        # discount_cents_for, inlined
+        discount.append(
+            sum([(lt * d_mul + d_add) // d_div for lt in line_totals if lt > threshold])
+        )
+    return gross, discount, items
+
+
+def _aggregate_records(
+    records: Sequence[OrderRecord],
+    group_id: Sequence[int],
+    n_groups: int,
+    offsets: Optional[List[int]] = None,
+) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Same reduction as _aggregate, reading the cent totals each OrderRecord
+    computed in __post_init__. The offsets are not needed here.
+    """
+    gross = [0] * n_groups
+    discount = [0] * n_groups
+    items = [0] * n_groups
+    for r, g in zip(records, group_id):
+        gross[g] += r.line_total_cents
+        discount[g] += r.discount_cents
+        items[g] += r.quantity
+    return gross, discount, items
+
+
 # Report Formatting / Output
+# Report layout: fixed-width, left-aligned columns separated by two spaces.
+# The last column is not padded, so rows carry no trailing whitespace.
+_REPORT_COLS: List[Tuple[str, int]] = [
+    ("Customer Name", 24),
+    ("# Orders", 9),
+    ("Total Items", 12),
+    ("Gross Total", 12),
+    ("Discount", 12),
+    ("Net Total", 12),
+]
+_REPORT_WIDTH = sum(w for _, w in _REPORT_COLS) + 2 * (len(_REPORT_COLS) - 1)
+_HEADER_FMT = "{:<24}  {:<9}  {:<12}  {:<12}  {:<12}  {}"
+_ROW_FMT = "{:<24}  {:<9}  {:<12}  {:<12.2f}  {:<12.2f}  {:.2f}"
+
+
 def format_report(summaries: List[CustomerSummary]) -> str:
     """
     Requirement (5): Properly formatted columns + grand total row.
     """
-    cols: List[Tuple[str, int]] = [
-        ("Customer Name", 24),
-        ("# Orders", 9),
-        ("Total Items", 12),
-        ("Gross Total", 12),
-        ("Discount", 12),
-        ("Net Total", 12),
-    ]
+    return "\n".join(iter_report_lines(summaries)) + "\n"
 
-    def line(values: List[Tuple[str, int]]) -> str:
-        return "  ".join(str(v).ljust(w) for v, w in values).rstrip()
 
-    total_width = sum(w for _, w in cols) + 2 * (len(cols) - 1)
-    out: List[str] = []
-    out.append(line(cols))
-    out.append("-" * total_width)
+def iter_report_lines(summaries: Iterable[CustomerSummary]) -> Iterator[str]:
+    """
+    Yields the report one line at a time (without newlines), so it can be
+    streamed to a file without materializing the whole text.
+    """
+    row = _ROW_FMT.format
+    sep = "-" * _REPORT_WIDTH
+    yield _HEADER_FMT.format(*(name for name, _ in _REPORT_COLS))
+    yield sep
 
     g_orders = 0
     g_items = 0
@@ -252,17 +774,13 @@ def format_report(summaries: List[CustomerSummary]) -> str:
     g_net = Decimal("0.00")
 
     for s in summaries:
-        out.append(
-            line(
-                [
-                    (s.customer_name, 24),
-                    (str(s.num_orders), 9),
-                    (str(s.total_items), 12),
-                    (f"{s.gross_total:.2f}", 12),
-                    (f"{s.discount_total:.2f}", 12),
-                    (f"{s.net_total:.2f}", 12),
-                ]
-            )
+        yield row(
+            s.customer_name,
+            s.num_orders,
+            s.total_items,
+            s.gross_total,
+            s.discount_total,
+            s.net_total,
         )
         g_orders += s.num_orders
         g_items += s.total_items
@@ -270,27 +788,23 @@ def format_report(summaries: List[CustomerSummary]) -> str:
         g_discount += s.discount_total
         g_net += s.net_total
 
-    out.append("-" * total_width)
-    out.append(
-        line(
-            [
-                ("GRAND TOTAL", 24),
-                (str(g_orders), 9),
-                (str(g_items), 12),
-                (f"{money(g_gross):.2f}", 12),
-                (f"{money(g_discount):.2f}", 12),
-                (f"{money(g_net):.2f}", 12),
-            ]
-        )
-    )
-    return "\n".join(out) + "\n"
+    yield sep
+    yield row("GRAND TOTAL", g_orders, g_items, g_gross, g_discount, g_net)
 
 
-def write_report(output_path: str | Path, report_text: str) -> None:
+def write_report(output_path: str | Path, report: str | Iterable[str]) -> None:
+    """
+    Writes the report to output_path. Accepts either the full report text
+    or an iterable of lines (e.g. iter_report_lines), which is streamed.
+    """
     output_path = Path(output_path)
     logger.info("Writing report | %s", output_path)
     try:
-        output_path.write_text(report_text, encoding="utf-8")
+        with open(output_path, "w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as f:
+            if isinstance(report, str):
+                f.write(report)
+            else:
+                f.writelines(ln + "\n" for ln in report)
     except Exception as e:
         logger.exception("Cannot write output file | %s", e)
         raise OutputFileError(f"Cannot write output file: {output_path}") from e
@@ -304,10 +818,9 @@ def main() -> None:
     parser.add_argument("--error", required=True, help="Path to error file for malformed records")
     args = parser.parse_args()
 
-    records = read_orders(args.input, args.error)
+    records = read_orders_parallel(args.input, args.error)
     summaries = summarize_by_customer(records)
-    report = format_report(summaries)
-    write_report(args.output, report)
+    write_report(args.output, iter_report_lines(summaries))
 
     logger.info("Complete | valid_records=%d customers=%d", len(records), len(summaries))
 
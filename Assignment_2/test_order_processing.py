@@ -3,12 +3,19 @@ from datetime import date
 from decimal import Decimal
 from pathlib import Path
 
-from exception import InputFileError, RecordParseError
+from exception import InputFileError, OutputFileError, RecordParseError
 from order_processing import (
+    OrdersTable,
+    discount_cents_for,
     parse_order_line,
+    iter_orders,
     read_orders,
+    read_orders_table,
+    read_orders_parallel,
     summarize_by_customer,
     format_report,
+    iter_report_lines,
+    write_report,
 )
 
 
@@ -38,6 +45,10 @@ def test_parse_order_line_success():
         "ORD001|John|Laptop|0|999.99|2024-03-15",    # zero qty
         "ORD001|John|Laptop|-2|999.99|2024-03-15",   # negative qty
         "ORD001|John|Laptop|2|999.99|03-15-2024",    # bad date
+        "ORD001|John|Laptop|2|999.99|20240315",      # ISO basic date, not YYYY-MM-DD
+        "ORD001|John|Laptop|2|999.99|2024-02-30",    # impossible date
+        "ORD001|John|Laptop|10000000000000000000|1.00|2024-01-01",  # qty over int64
+        "ORD001|John|Laptop|1|1e30|2024-01-01",      # price cents over int64
     ],
 )
 def test_parse_order_line_malformed(bad_line):
@@ -89,6 +100,41 @@ def test_read_orders_missing_input_raises(tmp_path: Path):
         read_orders(inp, err)
 
 
+def test_read_orders_splits_on_all_line_boundaries(tmp_path: Path):
+    # Same line breaks as str.splitlines(), not just \n / \r
+    inp = tmp_path / "orders.txt"
+    err = tmp_path / "errors.txt"
+    inp.write_text(
+        "ORD001|Alice|Pen|1|1.00|2024-01-01\x0cjunk\nBAD|LINE\u2028"
+        "ORD002|Bob|Mouse|2|25.50|2024-01-02\n",
+        encoding="utf-8",
+    )
+
+    records = read_orders(inp, err)
+
+    assert [r.order_id for r in records] == ["ORD001", "ORD002"]
+    assert [ln.split(":")[0] for ln in err.read_text(encoding="utf-8").splitlines()] == [
+        "Line 2",
+        "Line 3",
+    ]
+    err_par = tmp_path / "errors_par.txt"
+    assert list(read_orders_parallel(inp, err_par, max_workers=2, chunk_size=16)) == records
+    assert err_par.read_text(encoding="utf-8") == err.read_text(encoding="utf-8")
+
+
+@pytest.mark.skipif(not Path("/dev/full").exists(), reason="needs /dev/full")
+def test_read_orders_error_file_write_failure_raises(tmp_path: Path):
+    # /dev/full accepts the open but fails when the buffered errors are flushed
+    inp = tmp_path / "orders.txt"
+    inp.write_text("BAD|LINE\nORD001|Alice|Pen|1|1.00|2024-01-01\n", encoding="utf-8")
+    with pytest.raises(OutputFileError):
+        read_orders(inp, "/dev/full")
+    with pytest.raises(OutputFileError):
+        read_orders_table(inp, "/dev/full")
+    with pytest.raises(OutputFileError):
+        read_orders_parallel(inp, "/dev/full", max_workers=2, chunk_size=16)
+
+
 # -----------------------------
 # Aggregation + discount tests
 # -----------------------------
@@ -106,6 +152,32 @@ def test_discount_applies_only_when_line_total_over_500():
     assert r2.net_total == Decimal("500.00")
 
 
+def test_integer_cent_totals_match_decimal_totals():
+    r = parse_order_line("ORD102|Alice|Desk|3|183.35|2024-01-01")
+    assert r.unit_price_cents == 18335
+    assert r.line_total_cents == 55005
+    assert r.discount_cents == 5501  # 5500.5 rounds half-up
+    assert r.net_total_cents == 49504
+    assert r.discount == Decimal("55.01")
+
+
+def test_summarize_by_customer_accepts_iterators(tmp_path: Path):
+    inp = tmp_path / "orders.txt"
+    err = tmp_path / "errors.txt"
+    inp.write_text(
+        "ORD001|Alice|Laptop|1|600.00|2024-01-01\n"
+        "ORD002|Bob|Mouse|2|25.50|2024-01-02\n"
+        "ORD003|Alice|Pen|3|1.00|2024-01-03\n",
+        encoding="utf-8",
+    )
+    expected = summarize_by_customer(read_orders(inp, err))
+
+    assert summarize_by_customer(iter_orders(inp, err)) == expected
+    assert summarize_by_customer(r for r in read_orders(inp, err)) == expected
+    assert expected[0].num_orders == 2
+    assert expected[0].gross_total == Decimal("603.00")
+
+
 def test_summarize_by_customer_counts_unique_orders_and_totals():
     records = [
         parse_order_line("ORD001|Alice|Pen|10|1.00|2024-01-01"),          # line_total 10 no discount
@@ -131,6 +203,109 @@ def test_summarize_by_customer_counts_unique_orders_and_totals():
     assert bob.net_total == Decimal("25.00")
 
 
+def test_summarize_clustered_and_interleaved_tables_agree():
+    clustered = [
+        parse_order_line("ORD001|Alice|Pen|10|1.00|2024-01-01"),
+        parse_order_line("ORD001|Alice|Notebook|2|5.00|2024-01-01"),
+        parse_order_line("ORD002|Alice|Laptop|1|600.00|2024-01-02"),
+        parse_order_line("ORD010|Bob|Mouse|1|25.00|2024-01-03"),
+        parse_order_line("ORD011|Bob|Monitor|2|300.00|2024-01-04"),
+    ]
+    interleaved = [clustered[i] for i in (0, 3, 1, 4, 2)]
+
+    # Clustered customers take the contiguous-run reduction, interleaved ones
+    # the per-row kernel; both must match the record-list path.
+    expected = summarize_by_customer(clustered)
+    assert summarize_by_customer(OrdersTable.from_records(clustered)) == expected
+    assert summarize_by_customer(OrdersTable.from_records(interleaved)) == expected
+    assert [s.num_orders for s in expected] == [2, 2]
+    assert [s.discount_total for s in expected] == [Decimal("60.00"), Decimal("60.00")]
+
+
+@pytest.mark.parametrize("line_total_cents", [49999, 50000, 50001, 55005])
+def test_all_aggregation_paths_apply_discount_cents_for(line_total_cents):
+    # The kernels inline discount_cents_for for speed; they must agree with it
+    price = Decimal(line_total_cents).scaleb(-2)
+    rows = [
+        parse_order_line(f"ORD{i}|{name}|Item|1|{price}|2024-01-01")
+        for i, name in enumerate(["Alice", "Alice", "Bob", "Alice"])
+    ]
+    clustered = [rows[i] for i in (0, 1, 3, 2)]
+    expected = discount_cents_for(line_total_cents)
+
+    # Record list (cached totals), interleaved table (per-row kernel) and
+    # clustered table (run kernel)
+    for summaries in (
+        summarize_by_customer(rows),
+        summarize_by_customer(OrdersTable.from_records(rows)),
+        summarize_by_customer(OrdersTable.from_records(clustered)),
+    ):
+        alice, bob = summaries
+        assert alice.discount_total == Decimal(3 * expected).scaleb(-2)
+        assert bob.discount_total == Decimal(expected).scaleb(-2)
+
+
+def test_orders_table_matches_record_list(tmp_path: Path):
+    inp = tmp_path / "orders.txt"
+    err = tmp_path / "errors.txt"
+    inp.write_text(
+        "ORD001|Alice|Laptop|1|600.00|2024-01-01\n"
+        "ORD002|Bob|Mouse|2|25.50|2024-01-02\n"
+        "BAD|LINE\n",
+        encoding="utf-8",
+    )
+
+    records = read_orders(inp, err)
+    table = read_orders_table(inp, err)
+
+    assert len(table) == 2
+    assert table.row(1) == records[1]
+    assert table.order_date_ordinals[1] == date(2024, 1, 2).toordinal()
+    assert list(table) == records
+    assert summarize_by_customer(table) == summarize_by_customer(records)
+    assert summarize_by_customer(OrdersTable()) == []
+
+
+def test_read_orders_table_rejects_values_beyond_int64(tmp_path: Path):
+    inp = tmp_path / "orders.txt"
+    err = tmp_path / "errors.txt"
+    inp.write_text(
+        "ORD001|Alice|Pen|10000000000000000000|1.00|2024-01-01\n"
+        "ORD002|Bob|Mouse|2|25.50|2024-01-02\n",
+        encoding="utf-8",
+    )
+
+    table = read_orders_table(inp, err)
+
+    assert len(table) == 1
+    assert err.read_text(encoding="utf-8").startswith("Line 1: Quantity is too large")
+
+
+def test_read_orders_parallel_matches_single_process(tmp_path: Path):
+    inp = tmp_path / "orders.txt"
+    err = tmp_path / "errors.txt"
+    err_par = tmp_path / "errors_par.txt"
+    inp.write_text(
+        "ORD001|Alice|Laptop|1|600.00|2024-01-01\n"
+        "\n"
+        "BAD|LINE\n"
+        "ORD002|Bob|Mouse|2|25.50|2024-01-02\r\n"
+        "ORD003|Alice|Desk|x|10.00|2024-01-03\n"
+        "ORD004|Cara|Chair|3|45.00|2024-01-04\r"
+        "ORD005|Dan|Pen|1|1.00|2024-01-05",
+        encoding="utf-8",
+        newline="",
+    )
+
+    table = read_orders_table(inp, err)
+    # Tiny chunks force one worker per line
+    par = read_orders_parallel(inp, err_par, max_workers=2, chunk_size=16)
+
+    assert list(par) == list(table)
+    assert err_par.read_text(encoding="utf-8") == err.read_text(encoding="utf-8")
+    assert "Line 2:" in err_par.read_text(encoding="utf-8")
+
+
 # -----------------------------
 # Report formatting tests
 # -----------------------------
@@ -147,3 +322,12 @@ def test_format_report_has_grand_total_row():
     assert "625.00" in report
     assert "60.00" in report
     assert "565.00" in report
+
+
+def test_write_report_streams_same_text_as_format_report(tmp_path: Path):
+    summaries = summarize_by_customer(
+        [parse_order_line("ORD001|Alice|Laptop|1|600.00|2024-01-01")]
+    )
+    out = tmp_path / "report.txt"
+    write_report(out, iter_report_lines(summaries))
+    assert out.read_text(encoding="utf-8") == format_report(summaries)